@@ -254,6 +254,113 @@ def run_i_atcorr(radiance_flag, input_band, input_range, elevation, visibility,
         output=output,
         **params)
 
+
+def acquisition_metadata(metafile):
+    '''
+    Read month, day and time (GMT in decimal hours) of acquisition from the
+    metadata file, and the scene's center longitude and latitude from the
+    current region
+    '''
+    # Month, day
+    date = grass.parse_command('i.landsat.toar', flags='p',
+                               input='dummy', output='dummy',
+                               metfile=metafile, lsatmet='date')
+    mon = int(date['date'][5:7])  # Month of acquisition
+    day = int(date['date'][8:10])  # Day of acquisition
+
+    # GMT in decimal hours
+    gmt = grass.read_command('i.landsat.toar', flags='p',
+                             input='dummy', output='dummy',
+                             metfile=metafile, lsatmet='time')
+    gmt = float(gmt.rstrip('\n'))
+
+    # Scene's center coordinates
+    cll = grass.parse_command('g.region', flags='clg')
+    lon = float(cll['center_long'])  # Center Longitude [decimal degrees]
+    lat = float(cll['center_lat'])  # Center Latitude [decimal degrees]
+
+    return mon, day, gmt, lon, lat
+
+
+def aerosol_optical_depth(aod, mon):
+    '''
+    Return the AOD given, or a sane default based on the month of acquisition
+    '''
+    if aod:
+        return float(aod)
+
+    # sane defaults
+    if 4 < mon < 10:
+        return float(0.222)  # summer
+    else:
+        return float(0.111)  # winter
+
+
+def correct_band(radiance_flag, sensor, band, inputband, acquisition,
+                 atm, aer, vis, aod, xps, elevation, visibility):
+    '''
+    Generate the 6S parameterization file for a band of a sensor and run
+    i.atcorr on it. Returns the name of the (temporary) atmospherically
+    corrected map.
+    '''
+    mon, day, gmt, lon, lat = acquisition
+
+    # Generate 6S parameterization file
+    p6s = Parameters(geo=geo[sensor],
+                     mon=mon, day=day, gmt=gmt, lon=lon, lat=lat,
+                     atm=atm,
+                     aer=aer,
+                     vis=vis,
+                     aod=aod,
+                     xps=xps, xpp=xpp,
+                     bnd=sensors[sensor][band])
+
+    #
+    # Temporary files
+    #
+    tmpfile = grass.tempfile()
+    tmp = "tmp." + grass.basename(tmpfile)  # use its basename
+
+    tmp_p6s = grass.tempfile()  # 6S Parameters ASCII file
+    tmp_atm_cor = "%s_cor_out" % tmp  # Atmospherically Corrected Img
+
+    p6s.export_ascii(tmp_p6s)
+
+    # Process band-wise atmospheric correction with 6s
+    msg = "6S parameters:\n\n"
+    msg += p6s.parameters
+    g.message(msg)
+
+    # inform about input's range?
+    input_range = grass.parse_command('r.info', flags='r', map=inputband)
+    input_range['min'] = float(input_range['min'])
+    input_range['max'] = float(input_range['max'])
+    msg = "Input range: %.2f ~ %.2f" % (input_range['min'], input_range['max'])
+    g.message(msg)
+
+    #
+    # Applying 6S Atmospheric Correction algorithm
+    #
+    run_i_atcorr(radiance_flag,
+                 inputband,
+                 input_range,
+                 elevation,
+                 visibility,
+                 tmp_p6s,
+                 tmp_atm_cor,
+                 (0,1))
+
+    # inform about output's range?
+    output_range = grass.parse_command('r.info', flags='r', map=tmp_atm_cor)
+    output_range['min'] = float(output_range['min'])
+    output_range['max'] = float(output_range['max'])
+    msg = "Output range: %.2f ~ %.2f" \
+        % (output_range['min'], output_range['max'])
+    g.message(msg)
+
+    return tmp_atm_cor
+
+
 def main():
     """ """
     sensor = options['sensor']
@@ -269,7 +376,7 @@ def main():
     aer = int(options['aerosols_model'])  # Aerosols model [index]
 
     vis = options['visibility_range']  # Visibility [km]
-    aod = options['aerosol_optical_depth']  # Aerosol Optical Depth at 550nm
+    aod = options['aerosols_optical_depth']  # Aerosol Optical Depth at 550nm
 
     xps = options['altitude']  # Mean Target Altitude [negative km]
     if not xps:
@@ -316,23 +423,8 @@ def main():
 
     msg = "Acquisition metadata for 6S code (line 2 in Parameters file)\n"
 
-    # Month, day
-    date = grass.parse_command('i.landsat.toar', flags='p',
-                               input='dummy', output='dummy',
-                               metfile=metafile, lsatmet='date')
-    mon = int(date['date'][5:7])  # Month of acquisition
-    day = int(date['date'][8:10])  # Day of acquisition
-
-    # GMT in decimal hours
-    gmt = grass.read_command('i.landsat.toar', flags='p',
-                             input='dummy', output='dummy',
-                             metfile=metafile, lsatmet='time')
-    gmt = float(gmt.rstrip('\n'))
-
-    # Scene's center coordinates
-    cll = grass.parse_command('g.region', flags='clg')
-    lon = float(cll['center_long'])  # Center Longitude [decimal degrees]
-    lat = float(cll['center_lat'])  # Center Latitude [decimal degrees]
+    acquisition = acquisition_metadata(metafile)
+    mon, day, gmt, lon, lat = acquisition
 
     msg += str(mon) + ' ' + str(day) + ' ' + str(gmt) + ' ' + \
         str(lon) + ' ' + str(lat)
@@ -341,15 +433,7 @@ def main():
     # 
     # AOD
     #
-    if aod:
-        aod = float(options['aerosol_optical_depth'])
-
-    else:
-        # sane defaults
-        if 4 < mon < 10:
-            aod = float(0.222)  # summer
-        else:
-            aod = float(0.111)  # winter
+    aod = aerosol_optical_depth(aod, mon)
 
     #
     # Mapsets are Scenes. Read'em all!
@@ -389,58 +473,9 @@ def main():
             g.message(msg)
 
 
-            # Generate 6S parameterization file
-            p6s = Parameters(geo=geo[sensor],
-                             mon=mon, day=day, gmt=gmt, lon=lon, lat=lat,
-                             atm=atm,
-                             aer=aer,
-                             vis=vis,
-                             aod=aod,
-                             xps=xps, xpp=xpp,
-                             bnd=sensors[sensor][band])
-            
-            #
-            # Temporary files
-            #
-            tmpfile = grass.tempfile()
-            tmp = "tmp." + grass.basename(tmpfile)  # use its basename
-
-            tmp_p6s = grass.tempfile()  # 6S Parameters ASCII file
-            tmp_atm_cor = "%s_cor_out" % tmp  # Atmospherically Corrected Img
-
-            p6s.export_ascii(tmp_p6s)
-
-            # Process band-wise atmospheric correction with 6s
-            msg = "6S parameters:\n\n"
-            msg += p6s.parameters
-            g.message(msg)
-
-            # inform about input's range?
-            input_range = grass.parse_command('r.info', flags='r', map=inputband)
-            input_range['min'] = float(input_range['min'])
-            input_range['max'] = float(input_range['max'])
-            msg = "Input range: %.2f ~ %.2f" % (input_range['min'], input_range['max'])
-            g.message(msg)
-
-            #
-            # Applying 6S Atmospheric Correction algorithm
-            #
-            run_i_atcorr(radiance_flag,
-                         inputband,
-                         input_range,
-                         elevation_map,
-                         visibility_map,
-                         tmp_p6s,
-                         tmp_atm_cor,
-                         (0,1))
-        
-            # inform about output's range?
-            output_range = grass.parse_command('r.info', flags='r', map=tmp_atm_cor)
-            output_range['min'] = float(output_range['min'])
-            output_range['max'] = float(output_range['max'])
-            msg = "Output range: %.2f ~ %.2f" \
-                % (output_range['min'], output_range['max'])
-            g.message(msg)
+            tmp_atm_cor = correct_band(radiance_flag, sensor, band, inputband,
+                                       acquisition, atm, aer, vis, aod, xps,
+                                       elevation_map, visibility_map)
 
             # add suffix to basename & rename end product
             atm_cor_nam = ("%s%s.%s" % (prefix, suffix, band))
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for the regression tests of i.landsat.atcorr
+
+Reference data (golden parameter files, reference reflectance maps and
+per-stage time budgets) live under 'data/'. Set the environment variable
+I_LANDSAT_ATCORR_UPDATE_REFERENCE=1 to (re-)record them instead of
+comparing against them. Set I_LANDSAT_ATCORR_BUDGET_SCALE to scale the
+recorded budgets on a slower (or faster) host.
+"""
+
+import os
+import sys
+import imp
+import time
+try:
+    from shutil import which
+except ImportError:  # Python 2
+    from distutils.spawn import find_executable as which
+
+TESTSUITE = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.dirname(TESTSUITE)
+DATA = os.path.join(TESTSUITE, 'data')
+PARAMETERS = os.path.join(DATA, 'parameters')
+REFERENCE = os.path.join(DATA, 'reference')
+BUDGETS = os.path.join(DATA, 'budgets.txt')
+METAFILE = os.path.join(SOURCE, 'testing', 'landsat_MTL.txt')
+
+UPDATE = os.environ.get('I_LANDSAT_ATCORR_UPDATE_REFERENCE', '') == '1'
+
+# budgets are recorded as the median time of RUNS runs of a stage,
+# stretched by MARGIN
+RUNS = 5
+MARGIN = 3
+
+# budgets are multiplied by SCALE when checked, e.g. 2 for a host twice as
+# slow as the one that recorded them
+SCALE = float(os.environ.get('I_LANDSAT_ATCORR_BUDGET_SCALE', '1'))
+
+
+def load_module():
+    """
+    Import the i.landsat.atcorr script as a module, so as to reach its
+    constants (geo, xpp, sensors) and the Parameters class it uses
+    """
+    if SOURCE not in sys.path:
+        sys.path.insert(0, SOURCE)
+    return imp.load_source('i_landsat_atcorr',
+                           os.path.join(SOURCE, 'i.landsat.atcorr.py'))
+
+
+def check_installed(testcase):
+    """
+    Fail the test case unless the i.landsat.atcorr found in PATH, along with
+    its parameters.py, is the one of this source tree
+    """
+    script = which('i.landsat.atcorr')
+    if not script:
+        testcase.fail("i.landsat.atcorr is not installed, "
+                      "install it from <%s> first" % SOURCE)
+
+    etc = os.path.join(os.path.dirname(os.path.dirname(script)),
+                       'etc', 'i.landsat.atcorr')
+    for installed, source in ((script, 'i.landsat.atcorr.py'),
+                              (os.path.join(etc, 'parameters.py'),
+                               'parameters.py')):
+        with open(os.path.join(SOURCE, source), 'rb') as sourcef:
+            expected = sourcef.read()
+        if not os.path.exists(installed):
+            testcase.fail("<%s> is missing, re-install i.landsat.atcorr "
+                          "from <%s>" % (installed, SOURCE))
+        with open(installed, 'rb') as installedf:
+            if installedf.read() != expected:
+                testcase.fail("<%s> differs from <%s>, re-install "
+                              "i.landsat.atcorr from this source tree"
+                              % (installed, source))
+
+
+def measure(function):
+    """
+    Run a function, RUNS times if updating reference data, else once. Return
+    the result of the last run and the median of the elapsed times.
+    """
+    timings = []
+    for run in range(RUNS if UPDATE else 1):
+        start = time.time()
+        result = function()
+        timings.append(time.time() - start)
+    timings.sort()
+    return result, timings[len(timings) // 2]
+
+
+def read_budgets():
+    """
+    Read per-stage time budgets [seconds] as a dictionary. Lines are
+    'stage seconds', '#' starts a comment.
+    """
+    budgets = {}
+    if not os.path.exists(BUDGETS):
+        return budgets
+    with open(BUDGETS) as budgetsf:
+        for line in budgetsf:
+            line = line.split('#')[0].strip()
+            if not line:
+                continue
+            stage, seconds = line.split()
+            budgets[stage] = float(seconds)
+    return budgets
+
+
+def record_budget(stage, seconds):
+    """Record the budget of a stage, as the measured time times MARGIN"""
+    budgets = read_budgets()
+    budgets[stage] = round(seconds * MARGIN, 4)
+    with open(BUDGETS, 'w') as budgetsf:
+        budgetsf.write('# stage  budget [seconds]\n')
+        for key in sorted(budgets):
+            budgetsf.write('%s %s\n' % (key, budgets[key]))
+
+
+def check_budget(testcase, stage, seconds):
+    """
+    Fail the test case if a stage took longer than its recorded budget.
+    Record the budget instead, if updating reference data.
+    """
+    if UPDATE:
+        record_budget(stage, seconds)
+        return
+
+    budgets = read_budgets()
+    if stage not in budgets:
+        testcase.fail("No time budget recorded for stage <%s>, "
+                      "run with I_LANDSAT_ATCORR_UPDATE_REFERENCE=1"
+                      % stage)
+
+    budget = budgets[stage] * SCALE
+    testcase.assertLessEqual(seconds, budget,
+                             msg="Stage <%s> took %.4f s, budget is %.4f s"
+                             % (stage, seconds, budget))
+
+
+def check_reference(testcase, path):
+    """
+    Fail the test case if a reference file has not been recorded, unless
+    updating reference data
+    """
+    if not UPDATE and not os.path.exists(path):
+        testcase.fail("No reference recorded in <%s>, "
+                      "run with I_LANDSAT_ATCORR_UPDATE_REFERENCE=1"
+                      % os.path.relpath(path, TESTSUITE))
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Test atmospheric correction of small fixture rasters against stored reference
+reflectance, and time the module's correct_band() on each band on its own
+
+Fixture Digital Numbers are generated for all ETM+ bands over a 20x20 cells
+region of the North Carolina sample Location. The 'testing/landsat_MTL.txt'
+metadata file is copied in the mapset's 'cell_misc' element, where the module
+looks for it.
+"""
+
+import os
+import shutil
+
+import grass.script as grass
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+from grass.gunittest.gmodules import SimpleModule
+
+import regression
+
+SENSOR = 'etm'
+PREFIX = 'test_i_landsat_atcorr_'
+SUFFIX = 'AtmCor'
+PRECISION = 1e-4  # reflectance tolerance
+
+# options as the module receives them from the parser
+OPTIONS = dict(atmospheric_model='2', aerosols_model='1', altitude='-0.110')
+
+
+class TestAtmosphericCorrection(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Generate fixture bands and place the metadata file"""
+        cls.atcorr = regression.load_module()
+        cls.bands = sorted(cls.atcorr.sensors[SENSOR])
+
+        cls.use_temp_region()
+        cls.runModule('g.region', n=220600, s=220000, w=638000, e=638600,
+                      res=30)
+
+        # maps created by the tests, removed when done
+        cls.maps = []
+        for band in cls.bands:
+            cls.maps.append('%s%d' % (PREFIX, band))
+            cls.runModule('r.mapcalc',
+                          expression='%s = int(40 + 10 * %d + row() + col())'
+                          % (cls.maps[-1], band))
+
+        env = grass.gisenv()
+        cell_misc = os.path.join(env['GISDBASE'], env['LOCATION_NAME'],
+                                 env['MAPSET'], 'cell_misc')
+        if not os.path.exists(cell_misc):
+            os.makedirs(cell_misc)
+        cls.metafile = os.path.join(cell_misc,
+                                    os.path.basename(regression.METAFILE))
+        shutil.copy(regression.METAFILE, cls.metafile)
+
+        # the module restricts the search path to the current mapset
+        cls.search_path = grass.read_command('g.mapsets', flags='p').split()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.runModule('g.mapsets', operation='set',
+                      mapset=','.join(cls.search_path))
+        cls.runModule('g.remove', flags='f', type='raster',
+                      name=','.join(cls.maps))
+        os.remove(cls.metafile)
+        cls.del_temp_region()
+
+    def reference(self, band):
+        """Path to the stored reference reflectance of a band"""
+        return os.path.join(regression.REFERENCE,
+                            '%s_band%d.asc' % (SENSOR, band))
+
+    def test_reflectance(self):
+        """Corrected bands match the reference reflectance within tolerance"""
+        regression.check_installed(self)
+
+        # overwrite outputs of the previous runs when recording budgets
+        module = SimpleModule('i.landsat.atcorr', sensor=SENSOR,
+                              mapsets='current',
+                              input_prefix=PREFIX, output_suffix=SUFFIX,
+                              metafile=os.path.basename(self.metafile),
+                              overwrite=True, **OPTIONS)
+        seconds = regression.measure(lambda: self.assertModule(module))[1]
+        regression.check_budget(self, 'i.landsat.atcorr', seconds)
+
+        if regression.UPDATE and not os.path.exists(regression.REFERENCE):
+            os.makedirs(regression.REFERENCE)
+
+        for band in self.bands:
+            output = '%s%s.%d' % (PREFIX, SUFFIX, band)
+            reference = '%sreference_%d' % (PREFIX, band)
+            self.maps.append(output)
+
+            if regression.UPDATE:
+                self.runModule('r.out.ascii', input=output, precision=9,
+                               output=self.reference(band))
+                continue
+
+            regression.check_reference(self, self.reference(band))
+            self.runModule('r.in.ascii', input=self.reference(band),
+                           output=reference, type='FCELL')
+            self.maps.append(reference)
+            self.assertRastersNoDifference(actual=output,
+                                           reference=reference,
+                                           precision=PRECISION)
+
+    def test_aerosols_optical_depth(self):
+        """An explicit AOD is used and changes the corrected reflectance"""
+        regression.check_installed(self)
+        module = SimpleModule('i.landsat.atcorr', sensor=SENSOR,
+                              mapsets='current',
+                              input_prefix=PREFIX, output_suffix='AOD',
+                              metafile=os.path.basename(self.metafile),
+                              aerosols_optical_depth=0.2, **OPTIONS)
+        self.assertModule(module)
+
+        for band in self.bands:
+            output = '%sAOD.%d' % (PREFIX, band)
+            self.maps.append(output)
+
+            if regression.UPDATE:
+                continue
+
+            # compare against the reference for the default AOD
+            regression.check_reference(self, self.reference(band))
+            reference = '%sreference_aod_%d' % (PREFIX, band)
+            difference = '%sdifference_aod_%d' % (PREFIX, band)
+            self.runModule('r.in.ascii', input=self.reference(band),
+                           output=reference, type='FCELL')
+            self.maps.append(reference)
+            self.runModule('r.mapcalc', expression='%s = abs(%s - %s)'
+                           % (difference, output, reference))
+            self.maps.append(difference)
+
+            univar = grass.parse_command('r.univar', flags='g',
+                                         map=difference)
+            self.assertGreater(float(univar['max']), PRECISION,
+                               msg="Band %d corrected with AOD 0.2 does not "
+                               "differ from the default AOD reference" % band)
+
+    def test_i_atcorr_stage(self):
+        """i.atcorr on each band runs within its own budget"""
+        acquisition = self.atcorr.acquisition_metadata(self.metafile)
+        aod = self.atcorr.aerosol_optical_depth('', acquisition[0])
+        def correct_band(band):
+            """Correct a band, keeping track of the output map"""
+            self.maps.append(self.atcorr.correct_band(
+                '', SENSOR, band, '%s%d' % (PREFIX, band), acquisition,
+                int(OPTIONS['atmospheric_model']),
+                int(OPTIONS['aerosols_model']),
+                '', aod, OPTIONS['altitude'], '', ''))
+
+        for band in self.bands:
+            seconds = regression.measure(lambda: correct_band(band))[1]
+            regression.check_budget(self, 'i.atcorr.band%d' % band, seconds)
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Test 6S parameter files built for all sensors and bands against golden files
+
+Acquisition conditions follow 'testing/landsat_MTL.txt' (2000-03-31,
+15:45:43 GMT) and main()'s defaults for a winter acquisition.
+"""
+
+import os
+import tempfile
+import shutil
+
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+import regression
+
+ACQUISITION = dict(mon=3, day=31, gmt=15.762,
+                   lon=-78.677, lat=35.763,
+                   atm=2, aer=1,
+                   vis='',  # as given by the (empty) visibility_range option
+                   aod=0.111,
+                   xps='-0.110')  # as given by the altitude option
+
+
+class TestParameters(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Import the module's constants and prepare an output directory"""
+        cls.atcorr = regression.load_module()
+        cls.output = tempfile.mkdtemp(prefix='i.landsat.atcorr.')
+        if regression.UPDATE and not os.path.exists(regression.PARAMETERS):
+            os.makedirs(regression.PARAMETERS)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.output)
+
+    def build(self, sensor, band):
+        """Build and export the 6S parameters for a sensor's band"""
+        p6s = self.atcorr.Parameters(geo=self.atcorr.geo[sensor],
+                                     xpp=self.atcorr.xpp,
+                                     bnd=self.atcorr.sensors[sensor][band],
+                                     **ACQUISITION)
+        name = '%s_band%s.txt' % (sensor, band)
+        p6s.export_ascii(os.path.join(self.output, name))
+        return name
+
+    def test_parameters_files(self):
+        """Parameters files for all sensors match the golden files"""
+        names, seconds = regression.measure(
+            lambda: [self.build(sensor, band)
+                     for sensor in sorted(self.atcorr.sensors)
+                     for band in sorted(self.atcorr.sensors[sensor])])
+        regression.check_budget(self, 'parameters', seconds)
+
+        for name in names:
+            golden = os.path.join(regression.PARAMETERS, name)
+            if regression.UPDATE:
+                shutil.copy(os.path.join(self.output, name), golden)
+                continue
+            with open(os.path.join(self.output, name), 'rb') as built:
+                with open(golden, 'rb') as expected:
+                    self.assertEqual(built.read(), expected.read(),
+                                     msg="Parameters file <%s> differs from "
+                                     "the golden file" % name)
+
+    def test_invalid_month(self):
+        """Out of range month is refused"""
+        acquisition = dict(ACQUISITION, mon=13)
+        with self.assertRaises(ValueError):
+            self.atcorr.Parameters(geo=8, xpp=-1000, bnd=61, **acquisition)
+
+
+if __name__ == '__main__':
+    test()